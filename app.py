@@ -4,7 +4,8 @@ import os
 import time
 import random
 from PIL import Image
-from best_first_search import BestFirstSearchRecipeFinder
+from index_manager import RECIPES_CSV, RecipeIndexManager, load_recipes
+from exploration_store import ExplorationRecord
 import json
 from streamlit_lottie import st_lottie
 from streamlit_tags import st_tags
@@ -14,6 +15,8 @@ if 'search_results' not in st.session_state:
     st.session_state.search_results = None
 if 'search_query' not in st.session_state:
     st.session_state.search_query = ""
+if 'exploration_data' not in st.session_state:
+    st.session_state.exploration_data = None
 
 # Load Lottie animation
 def load_lottie_file(filepath: str):
@@ -37,14 +40,15 @@ def get_suggestions(text):
     return [ing for ing in INGREDIENT_SUGGESTIONS if text in ing.lower()][:5]
 
 # --- Load dataset ---
-@st.cache_data
-def load_data():
-    df = pd.read_csv("recipes3k_cleaned.csv")  # use the CSV you created
-    df = df.dropna(subset=["ingredients"])
-    return df
+# Shared across sessions; rebuilt in the background when the CSV changes
+@st.cache_resource
+def get_index_manager():
+    return RecipeIndexManager(load_recipes, source_path=RECIPES_CSV)
 
-df = load_data()
-search_engine = BestFirstSearchRecipeFinder(df)
+index_manager = get_index_manager()
+index_manager.reload_if_changed()
+
+SEARCH_TOP_K = 5
 
 # Custom CSS for better UI
 st.markdown("""
@@ -141,7 +145,7 @@ ingredients_str = ' '.join(user_input) if user_input else "tomato onion garlic"
 
 # Check if we have previous search results to display
 if st.session_state.search_results is not None:
-    top_recipes, visited, search_query = st.session_state.search_results
+    top_recipes, search_query, generation_id = st.session_state.search_results
     st.success(f"Found {len(top_recipes)} delicious recipe{'s' if len(top_recipes) != 1 else ''} that match your ingredients!")
     
     # Center the heading and caption
@@ -157,6 +161,7 @@ if st.session_state.search_results is not None:
     
     # Display the search query that was used
     st.markdown(f'<p class="centered">Showing results for: <strong>{search_query}</strong></p>', unsafe_allow_html=True)
+    st.caption(f"Index generation {generation_id}")
     
     # Add a button to clear the results
     if st.button("Clear Results", type="secondary"):
@@ -204,10 +209,14 @@ else:
             
             def perform_search():
                 try:
-                    top_recipes, visited = search_engine.search(ingredients_str, top_k=5)
-                    result_queue.put((top_recipes, visited, None))
+                    # Pin one index generation so a concurrent swap can't change names under us
+                    with index_manager.acquire() as generation:
+                        top_recipes, visited = generation.finder.search(ingredients_str, top_k=SEARCH_TOP_K)
+                        recipes = generation.finder.recipes
+                        visited = [(recipes.iloc[int(idx)]['name'], score) for idx, score in visited]
+                    result_queue.put((top_recipes, visited, generation.generation_id, None))
                 except Exception as e:
-                    result_queue.put((None, None, str(e)))
+                    result_queue.put((None, None, None, str(e)))
             
             # Start the search in a separate thread
             search_thread = threading.Thread(target=perform_search)
@@ -249,12 +258,12 @@ else:
                 try:
                     if not result_queue.empty():
                         result = result_queue.get()
-                        if result[2]:  # If there's an error
-                            st.error(f"Error during search: {result[2]}")
+                        if result[3]:  # If there's an error
+                            st.error(f"Error during search: {result[3]}")
                             loading_container.empty()
                             st.stop()  # Stop execution instead of returning
                         else:
-                            top_recipes, visited, _ = result
+                            top_recipes, visited, generation_id, _ = result
                             search_complete = True
                             break
                 except:
@@ -275,7 +284,12 @@ else:
                 time.sleep(0.5)  # Let the user see 100%
             
             # Store the search results in session state
-            st.session_state.search_results = (top_recipes, visited, ingredients_str)
+            st.session_state.search_results = (top_recipes, ingredients_str, generation_id)
+
+            # Store exploration data once per search for the exploration page
+            st.session_state.exploration_data = ExplorationRecord.from_visited(
+                ingredients_str, generation_id, SEARCH_TOP_K, visited
+            )
             
             # Clear the loading container and rerun
             loading_container.empty()
@@ -286,6 +300,10 @@ else:
     # Don't proceed further if we don't have search results
     st.stop()
 
+if not st.session_state.exploration_data:
+    st.warning("No recipes found. Please try different ingredients.")
+    st.stop()
+
 # Display the recipe results
 for idx, (_, row) in enumerate(top_recipes.iterrows(), 1):
     with st.container():
@@ -359,11 +377,6 @@ for idx, (_, row) in enumerate(top_recipes.iterrows(), 1):
         st.markdown("</div>", unsafe_allow_html=True)
         st.markdown("<br>", unsafe_allow_html=True)
         
-        # Store visited nodes data in session state for the exploration page
-        visited_data = [{"Recipe": df.iloc[int(idx)]['name'], "Heuristic": score} for idx, score in visited]
-        if visited_data:
-            st.session_state.exploration_data = pd.DataFrame(visited_data)
-            
         # Add smooth scroll to top button
         st.markdown("""
         <style>
@@ -387,16 +400,6 @@ for idx, (_, row) in enumerate(top_recipes.iterrows(), 1):
         <a href='#' class='back-to-top' title='Back to top'>↑</a>
         """, unsafe_allow_html=True)
 
-        # --- Store exploration data in session state for the exploration page ---
-        if visited:  # Check if visited is not empty
-            st.session_state.exploration_data = pd.DataFrame(
-                [(df.iloc[int(idx)]['name'], score) for idx, score in visited],
-                columns=["Recipe", "Heuristic"]
-            )
-        else:
-            st.warning("No recipes found. Please try different ingredients.")
-            st.stop()
-
 # --- Navigation link to exploration page ---
 st.markdown("---")
 if st.button("View Full Best First Search Exploration"):
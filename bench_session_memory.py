@@ -0,0 +1,214 @@
+"""Measure memory per Streamlit session for the search/exploration state.
+
+Compares the session state each layout leaves behind after one search:
+
+    baseline  st.session_state as the original app.py stored it:
+              search_results = (top_recipes DataFrame, visited [(idx, score)], query)
+              plus exploration_data as a DataFrame of names and scores
+    record    st.session_state as app.py stores it now:
+              search_results = (top_recipes DataFrame, query, generation_id)
+              plus exploration_data as an ExplorationRecord
+
+Sessions are AppTest sessions, but the page they run is HOLDER_PAGE, a stand-in
+that only reads the state back. It is not app.py, which needs the Lottie
+animation and runs the search itself. Each measurement runs in a fresh
+subprocess that first runs a throwaway session of both layouts, and the
+layouts alternate order across --repeats runs. The report gives the median.
+Only session_state is a layout-specific number; the per-session total also
+includes AppTest's own bookkeeping.
+
+A separate subprocess renders the real Exploration page for the record layout
+and measures the process-wide st.cache_data footprint of its memoized figures.
+The baseline page cached nothing, so its cache footprint is zero.
+
+    python bench_session_memory.py --sessions 100 --repeats 3
+"""
+import argparse
+import gc
+import json
+import os
+import pickle
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from best_first_search import BestFirstSearchRecipeFinder
+from exploration_store import ExplorationRecord
+from index_manager import RECIPES_CSV, load_recipes
+
+EXPLORATION_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages", "1__Exploration.py")
+
+# Stand-in page: reads the state back the way a rerun would, without app.py's rendering
+HOLDER_PAGE = """
+import streamlit as st
+st.write(len(st.session_state.search_results[0]), len(st.session_state.exploration_data))
+"""
+
+INGREDIENTS = [
+    'tomato', 'onion', 'garlic', 'chicken', 'beef', 'pasta', 'rice',
+    'cheese', 'mushroom', 'potato', 'carrot', 'broccoli', 'spinach',
+    'chocolate', 'flour', 'sugar', 'eggs', 'milk', 'butter', 'olive oil'
+]
+
+
+def baseline_state(names, query, top_k, top_recipes, visited):
+    return {
+        "search_results": (top_recipes, visited, query),
+        "search_query": query,
+        "exploration_data": pd.DataFrame(
+            [(names[int(idx)], score) for idx, score in visited],
+            columns=["Recipe", "Heuristic"]
+        ),
+    }
+
+
+def record_state(names, query, top_k, top_recipes, visited):
+    visited = [(names[int(idx)], score) for idx, score in visited]
+    return {
+        "search_results": (top_recipes, query, 1),
+        "search_query": query,
+        "exploration_data": ExplorationRecord.from_visited(query, 1, top_k, visited),
+    }
+
+
+LAYOUTS = {"baseline": baseline_state, "record": record_state}
+
+
+def build_states(build_state, data, top_k):
+    # Copy the search output so no two sessions share a DataFrame
+    return [
+        build_state(data["names"], query, top_k, top_recipes.copy(), list(visited))
+        for query, (top_recipes, visited) in data["searches"].items()
+    ]
+
+
+def run_session(make_app, state):
+    at = make_app()
+    for key, value in state.items():
+        at.session_state[key] = value
+    at.run(timeout=60)
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return at
+
+
+# --- Child side: one measurement per fresh process ---
+
+def measure_layout(layout, data, top_k):
+    holder = lambda: AppTest.from_string(HOLDER_PAGE)
+    # Throwaway pass of both layouts so one-time setup isn't charged to either
+    for warm_up in LAYOUTS.values():
+        run_session(holder, build_states(warm_up, data, top_k)[0])
+    gc.collect()
+
+    tracemalloc.start()
+    states = build_states(LAYOUTS[layout], data, top_k)
+    state_bytes, _ = tracemalloc.get_traced_memory()
+    sessions = [run_session(holder, state) for state in states]
+    del states
+    gc.collect()
+    total_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n = len(sessions)
+    return {"state_kib": state_bytes / n / 1024, "total_kib": total_bytes / n / 1024}
+
+
+def measure_cache(data, top_k):
+    page = lambda: AppTest.from_file(EXPLORATION_PAGE)
+    states = build_states(record_state, data, top_k)
+    run_session(page, states[0])
+    st.cache_data.clear()
+    gc.collect()
+
+    tracemalloc.start()
+    sessions = [run_session(page, state) for state in states]
+    del sessions, states
+    gc.collect()
+    # With the sessions gone, what clearing the cache frees is the cached figures
+    with_cache, _ = tracemalloc.get_traced_memory()
+    st.cache_data.clear()
+    gc.collect()
+    without_cache, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"cache_kib": (with_cache - without_cache) / 1024}
+
+
+def child(args):
+    with open(args.input, "rb") as f:
+        data = pickle.load(f)
+    if args.child == "cache":
+        result = measure_cache(data, args.top_k)
+    else:
+        result = measure_layout(args.child, data, args.top_k)
+    print(json.dumps(result))
+
+
+# --- Parent side: run the searches once, then fan out to fresh processes ---
+
+def run_child(mode, input_path, args):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode,
+         "--input", input_path, "--top-k", str(args.top_k)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(args):
+    random.seed(args.seed)
+    finder = BestFirstSearchRecipeFinder(load_recipes(args.data))
+    queries = set()
+    while len(queries) < args.sessions:
+        queries.add(" ".join(sorted(random.sample(INGREDIENTS, 3))))
+    searches = {query: finder.search(query, top_k=args.top_k) for query in sorted(queries)}
+    print(f"data={args.data} recipes={len(finder.recipes)} sessions={args.sessions} "
+          f"top_k={args.top_k} repeats={args.repeats}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "searches.pkl")
+        with open(input_path, "wb") as f:
+            pickle.dump({"names": list(finder.recipes["name"]), "searches": searches}, f)
+
+        runs = {layout: [] for layout in LAYOUTS}
+        for repeat in range(args.repeats):
+            order = list(LAYOUTS) if repeat % 2 == 0 else list(reversed(LAYOUTS))
+            for layout in order:
+                runs[layout].append(run_child(layout, input_path, args))
+        caches = [run_child("cache", input_path, args)["cache_kib"] for _ in range(args.repeats)]
+
+    for layout, results in runs.items():
+        state = [r["state_kib"] for r in results]
+        total = [r["total_kib"] for r in results]
+        print(
+            f"{layout:>9}: session_state median={statistics.median(state):.1f} KiB/session "
+            f"(runs {', '.join(f'{v:.1f}' for v in state)}); "
+            f"with AppTest bookkeeping median={statistics.median(total):.1f} KiB/session "
+            f"(runs {', '.join(f'{v:.1f}' for v in total)})"
+        )
+    print(
+        f"    cache: st.cache_data figures for {min(args.sessions, 64)} query ids (max_entries=64) "
+        f"median={statistics.median(caches):.0f} KiB (runs {', '.join(f'{v:.0f}' for v in caches)})"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-session memory of search/exploration state")
+    parser.add_argument("--data", default=RECIPES_CSV, help="recipe CSV to index")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=3, help="alternating runs per layout")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--child", choices=[*LAYOUTS, "cache"], help=argparse.SUPPRESS)
+    parser.add_argument("--input", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+    else:
+        main(args)
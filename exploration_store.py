@@ -0,0 +1,52 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+
+def make_query_id(query, generation_id, top_k):
+    """Stable id for one search; the same query on the same index gives the same results"""
+    key = f"{generation_id}|{top_k}|{' '.join(query.lower().split())}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+class ExplorationRecord:
+    """Compact, array-backed copy of the recipes a search visited.
+
+    Stored once per search in the session instead of a DataFrame, and used as the
+    cache key for the Exploration page's figures.
+    """
+
+    __slots__ = ("query_id", "query", "generation_id", "names", "scores")
+
+    def __init__(self, query_id, query, generation_id, names, scores):
+        self.query_id = query_id
+        self.query = query
+        self.generation_id = generation_id
+        self.names = tuple(names)
+        self.scores = np.asarray(scores, dtype=np.float32)
+
+    @classmethod
+    def from_visited(cls, query, generation_id, top_k, visited):
+        """Build from the (recipe name, heuristic) pairs returned by a search"""
+        names = [name for name, _ in visited]
+        scores = [score for _, score in visited]
+        return cls(make_query_id(query, generation_id, top_k), query, generation_id, names, scores)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def order(self):
+        return np.arange(1, len(self.names) + 1)
+
+    def top(self, n):
+        """Indices of the n best scores, best first"""
+        return np.argsort(-self.scores, kind="stable")[:n]
+
+    def to_frame(self):
+        return pd.DataFrame({
+            "Recipe": self.names,
+            "Heuristic": self.scores,
+            "Exploration Order": self.order,
+        })
@@ -0,0 +1,186 @@
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from best_first_search import BestFirstSearchRecipeFinder
+
+RECIPES_CSV = "recipes3k_cleaned.csv"  # use the CSV you created
+
+
+def load_recipes(path=RECIPES_CSV):
+    df = pd.read_csv(path)
+    df = df.dropna(subset=["ingredients"])
+    return df
+
+
+class IndexGeneration:
+    """One built search index, reference-counted so it can be released once idle"""
+
+    def __init__(self, generation_id, finder):
+        self.generation_id = generation_id
+        self.finder = finder
+        self.released = False
+        self._refs = 1  # the manager holds a reference while this is current
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self.released:
+                raise RuntimeError(f"Index generation {self.generation_id} was already released")
+            self._refs += 1
+        return self
+
+    def release(self):
+        with self._lock:
+            self._refs -= 1
+            if self._refs > 0:
+                return
+            # 🧹 Last reader is gone, drop the matrix and vectorizer
+            self.released = True
+            self.finder = None
+
+    @property
+    def refs(self):
+        with self._lock:
+            return self._refs
+
+
+class RecipeIndexManager:
+    """Holds the current search index and hot-swaps new generations in.
+
+    New generations are built on a background thread and swapped in atomically.
+    Searches that already acquired the old generation finish on it, and the old
+    generation is released once its last reader is done.
+    """
+
+    def __init__(self, loader, source_path=None, finder_factory=BestFirstSearchRecipeFinder,
+                 retry_after=30.0):
+        self._loader = loader
+        self._source_path = source_path
+        self._finder_factory = finder_factory
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._build_thread = None
+        self._building = False
+        self._pending = False
+        self._pending_recipes = None
+        self._source_mtime = self._read_mtime()
+        self._loading_mtime = None
+        self._retry_after = retry_after
+        self._failed_mtime = None
+        self._failed_at = None
+        self.last_error = None
+        self._current = IndexGeneration(next(self._ids), finder_factory(loader()))
+
+    @property
+    def generation_id(self):
+        with self._lock:
+            return self._current.generation_id
+
+    @contextmanager
+    def acquire(self):
+        """Pin the current generation for the duration of the block"""
+        with self._lock:
+            generation = self._current.acquire()
+        try:
+            yield generation
+        finally:
+            generation.release()
+
+    def search(self, user_input, top_k=3):
+        """Run a search on the current generation and report which one answered"""
+        with self.acquire() as generation:
+            top_recipes, exploration = generation.finder.search(user_input, top_k=top_k)
+        return top_recipes, exploration, generation.generation_id
+
+    def swap(self, finder):
+        """Install an already-built finder as the new current generation"""
+        with self._lock:
+            old = self._current
+            self._current = IndexGeneration(next(self._ids), finder)
+            new_id = self._current.generation_id
+        old.release()
+        return new_id
+
+    def reload(self, recipes=None, wait=False):
+        """Build a new generation in the background.
+
+        If a build is already running, one more build is queued to start when it
+        finishes, so changes made mid-build are never lost.
+        """
+        with self._lock:
+            if self._building:
+                self._pending = True
+                self._pending_recipes = recipes
+                thread = self._build_thread
+            else:
+                self._building = True
+                thread = threading.Thread(target=self._build, args=(recipes,), daemon=True)
+                self._build_thread = thread
+                thread.start()
+        if wait:
+            thread.join()
+        return thread
+
+    def reload_if_changed(self, wait=False):
+        """Start a rebuild when the source file differs from the last successful load"""
+        mtime = self._read_mtime()
+        with self._lock:
+            if mtime is None or mtime == self._source_mtime:
+                return None
+            # Back off after a failed build so every rerun doesn't re-index a broken file
+            if (mtime == self._failed_mtime
+                    and time.monotonic() - self._failed_at < self._retry_after):
+                return None
+            # The running build may already have picked up this version of the file
+            in_flight = self._building and not self._pending and mtime == self._loading_mtime
+            thread = self._build_thread
+        if not in_flight:
+            return self.reload(wait=wait)
+        if wait:
+            thread.join()
+        return thread
+
+    def _build(self, recipes):
+        while True:
+            # Read the mtime before loading, so an edit during the load still looks newer
+            mtime = self._read_mtime() if recipes is None else None
+            with self._lock:
+                self._loading_mtime = mtime
+            try:
+                finder = self._finder_factory(self._loader() if recipes is None else recipes)
+            except Exception as e:
+                # Keep serving the current generation if the new data can't be indexed.
+                # The mtime isn't recorded, so reload_if_changed() retries after the backoff.
+                self.last_error = e
+                with self._lock:
+                    self._failed_mtime = mtime
+                    self._failed_at = time.monotonic()
+            else:
+                self.last_error = None
+                self.swap(finder)
+                with self._lock:
+                    self._failed_mtime = None
+                    if mtime is not None:
+                        self._source_mtime = mtime
+
+            with self._lock:
+                self._loading_mtime = None
+                if not self._pending:
+                    self._building = False
+                    return
+                self._pending = False
+                recipes = self._pending_recipes
+                self._pending_recipes = None
+
+    def _read_mtime(self):
+        if self._source_path is None:
+            return None
+        try:
+            return os.path.getmtime(self._source_path)
+        except OSError:
+            return None
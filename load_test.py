@@ -0,0 +1,149 @@
+"""Local load generator for search_service.py.
+
+Start the service, then e.g.:
+
+    python load_test.py --clients 32 --requests 2000
+
+Each client keeps one HTTP/1.1 connection open and fires requests back to back.
+Reports throughput and latency percentiles.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+QUERIES = [
+    "tomato onion garlic",
+    "chicken rice",
+    "pasta cheese",
+    "beef potato carrot",
+    "chocolate flour sugar eggs",
+    "mushroom spinach",
+    "milk butter flour",
+    "broccoli garlic olive oil",
+]
+
+
+class Client:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        )
+        self.writer.write(head.encode("latin-1") + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        keep_alive = True
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name = name.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "connection" and value.strip().lower() == "close":
+                keep_alive = False
+        data = await self.reader.readexactly(length)
+        if not keep_alive:
+            self.close()
+        return status, json.loads(data) if data else None
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+async def run_client(args, queue, latencies, errors):
+    client = Client(args.host, args.port)
+    try:
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if args.batch > 1:
+                path = "/search/batch"
+                payload = {"queries": random.choices(QUERIES, k=args.batch), "top_k": args.top_k}
+            else:
+                path = "/search"
+                payload = {"query": random.choice(QUERIES), "top_k": args.top_k}
+            start = time.perf_counter()
+            try:
+                status, _ = await client.request("POST", path, payload)
+            except (ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+                client.close()
+                errors.append("connection")
+                continue
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        client.close()
+
+
+async def main(args):
+    random.seed(args.seed)
+    queue = asyncio.Queue()
+    for i in range(args.requests):
+        queue.put_nowait(i)
+    latencies, errors = [], []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(args, queue, latencies, errors) for _ in range(args.clients)))
+    elapsed = time.perf_counter() - start
+
+    health_client = Client(args.host, args.port)
+    try:
+        _, health = await health_client.request("GET", "/health")
+    finally:
+        health_client.close()
+
+    latencies.sort()
+    ms = [value * 1000 for value in latencies]
+    print(f"clients={args.clients} requests={args.requests} batch={args.batch} top_k={args.top_k}")
+    print(f"completed={len(latencies)} errors={len(errors)} elapsed={elapsed:.2f}s")
+    print(f"throughput={len(latencies) / elapsed:.1f} req/s")
+    if ms:
+        print(
+            f"latency ms: mean={sum(ms) / len(ms):.1f} p50={percentile(ms, 50):.1f} "
+            f"p90={percentile(ms, 90):.1f} p99={percentile(ms, 99):.1f} max={ms[-1]:.1f}"
+        )
+    print(
+        f"server: generation={health['generation']} searches={health['searches']} "
+        f"coalesced={health['coalesced']}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent load generator for the search service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--clients", type=int, default=16, help="concurrent connections")
+    parser.add_argument("--requests", type=int, default=1000, help="total requests across all clients")
+    parser.add_argument("--batch", type=int, default=1, help="queries per request; >1 uses /search/batch")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -39,7 +39,7 @@ st.title("Best First Search Algorithm Explorer")
 st.markdown("### Visualizing how the algorithm searches for recipes")
 
 # Check if we have exploration data in session state
-if 'exploration_data' not in st.session_state or st.session_state.exploration_data is None:
+if not st.session_state.get('exploration_data'):
     st.warning("⚠️ No exploration data found! Please run a search on the home page first.")
     st.image("https://media.giphy.com/media/v1.Y2lkPTc5MGI3NjExcjR2Z3ZzZ2VtY2F3bGZ6d2F3eWJjNnFzZ2JxY2RqZzB6b3Z0cCZlcD12MV9pbnRlcm5hbF9naWZfYnlfaWQmY3Q9Zw/3o7aTskHEUdgCQAXde/giphy.gif", 
              caption="Run a search to see the magic happen!")
@@ -49,10 +49,140 @@ if 'exploration_data' not in st.session_state or st.session_state.exploration_da
     st.stop()
 
 # Get data from session state
-visited_df = st.session_state.exploration_data.copy()
+record = st.session_state.exploration_data
+
+
+# --- Figures are memoized per query id, so switching tabs or rerunning reuses them ---
+# Arguments starting with "_" are not hashed by Streamlit; query_id alone is the key.
+# cache_data hands each session its own copy, so one session's render can't mutate another's.
+@st.cache_data(max_entries=64)
+def similarity_bar(query_id, _record):
+    top = slice(0, 15)
+    fig = px.bar(
+        x=list(_record.names[top]),
+        y=_record.scores[top],
+        color=_record.scores[top],
+        color_continuous_scale='Viridis',
+        labels={"x": "Recipe", "y": "Similarity Score", "color": "Similarity Score"},
+        height=500
+    )
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+
+@st.cache_data(max_entries=64)
+def heuristic_histogram(query_id, _record):
+    return px.histogram(
+        x=_record.scores,
+        nbins=20,
+        title="Distribution of Heuristic Scores",
+        labels={"x": "Heuristic"},
+        marginal="box"
+    )
+
+
+@st.cache_data(max_entries=64)
+def progression_line(query_id, _record):
+    fig = px.line(
+        x=_record.order,
+        y=_record.scores,
+        title="Best Heuristic Score Over Time",
+        labels={"x": "Exploration Step", "y": "Best Score"}
+    )
+    fig.update_traces(line=dict(width=3))
+    return fig
+
+
+@st.cache_data(max_entries=64)
+def discovery_scatter(query_id, _record):
+    return px.scatter(
+        x=_record.order,
+        y=_record.scores,
+        size=_record.scores,
+        hover_name=list(_record.names),
+        title="Recipe Discovery Order vs. Similarity Score",
+        labels={"x": "Exploration Order", "y": "Heuristic"}
+    )
+
+
+@st.cache_data(max_entries=64)
+def similarity_network(query_id, _record):
+    recipes = list(_record.names[:8])
+    edges = [(recipes[i], recipes[j]) for i in range(len(recipes))
+             for j in range(i + 1, len(recipes)) if i % 2 == j % 3]
+
+    G = nx.Graph()
+    G.add_edges_from(edges)
+    pos = nx.spring_layout(G, seed=42)
+
+    # Prepare edge traces
+    edge_x, edge_y = [], []
+    for edge in G.edges():
+        x0, y0 = pos[edge[0]]
+        x1, y1 = pos[edge[1]]
+        edge_x += [x0, x1, None]
+        edge_y += [y0, y1, None]
+
+    edge_trace = go.Scatter(
+        x=edge_x, y=edge_y,
+        line=dict(width=0.5, color='#888'),
+        hoverinfo='none',
+        mode='lines'
+    )
+
+    # Prepare node traces
+    node_x, node_y = [], []
+    for node in G.nodes():
+        x, y = pos[node]
+        node_x.append(x)
+        node_y.append(y)
+
+    # Create node trace
+    node_trace = go.Scatter(
+        x=node_x, 
+        y=node_y,
+        mode='markers+text',
+        text=[str(n) for n in G.nodes()],
+        textposition="top center",
+        hoverinfo='text'
+    )
+    
+    # Set marker properties
+    node_trace.marker = dict(
+        showscale=True,
+        colorscale='YlGnBu',
+        color=[len(list(G.neighbors(n))) for n in G.nodes()],
+        size=18,
+        line_width=2
+    )
+    
+    # Add colorbar configuration
+    node_trace.marker.colorbar = dict(
+        thickness=15,
+        title=dict(text='Connections', side='right'),
+        xanchor='left'
+    )
+
+    # Create the figure
+    fig = go.Figure(data=[edge_trace, node_trace])
+    
+    # Update layout with proper title font settings
+    fig.update_layout(
+        title_text="Ingredient Similarity Network",
+        title_font=dict(size=20),
+        showlegend=False,
+        hovermode='closest',
+        margin=dict(b=0, l=0, r=0, t=40),
+        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
+    )
+    return fig
+
+
+@st.cache_data(max_entries=64)
+def raw_frame(query_id, _record):
+    return _record.to_frame()
 
-# Add exploration order
-visited_df['Exploration Order'] = range(1, len(visited_df) + 1)
 
 # Create tabs for different visualizations
 tab1, tab2, tab3, tab4 = st.tabs([
@@ -68,25 +198,15 @@ with tab1:
     # Performance metrics
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Total Recipes Explored", len(visited_df))
+        st.metric("Total Recipes Explored", len(record))
     with col2:
-        st.metric("Best Heuristic Score", f"{visited_df['Heuristic'].max():.3f}")
+        st.metric("Best Heuristic Score", f"{record.scores.max():.3f}")
     with col3:
-        st.metric("Average Heuristic", f"{visited_df['Heuristic'].mean():.3f}")
+        st.metric("Average Heuristic", f"{record.scores.mean():.3f}")
     
     # Main bar chart
     st.subheader("Recipe Similarity Scores")
-    fig = px.bar(
-        visited_df.head(15), 
-        x="Recipe", 
-        y="Heuristic",
-        color="Heuristic",
-        color_continuous_scale='Viridis',
-        labels={"Heuristic": "Similarity Score"},
-        height=500
-    )
-    fig.update_layout(xaxis_tickangle=-45)
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(similarity_bar(record.query_id, record), use_container_width=True)
     
 with tab2:
     st.subheader("Heuristic Score Distribution")
@@ -95,47 +215,24 @@ with tab2:
     
     with col1:
         # Distribution plot
-        fig = px.histogram(
-            visited_df, 
-            x="Heuristic",
-            nbins=20,
-            title="Distribution of Heuristic Scores",
-            marginal="box"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(heuristic_histogram(record.query_id, record), use_container_width=True)
     
     with col2:
         # Top 5 recipes
         st.subheader("Top 5 Recipes")
-        top5 = visited_df.nlargest(5, 'Heuristic')
-        for idx, row in top5.iterrows():
-            st.markdown(f"**{row['Recipe']}**")
-            st.markdown(f"Score: {row['Heuristic']:.3f}")
+        for i in record.top(5):
+            st.markdown(f"**{record.names[i]}**")
+            st.markdown(f"Score: {record.scores[i]:.3f}")
             st.markdown("---")
     
 with tab3:
     st.subheader("Search Progression")
     
     # Progress over time
-    fig = px.line(
-        visited_df, 
-        y="Heuristic",
-        title="Best Heuristic Score Over Time",
-        labels={"index": "Exploration Step", "Heuristic": "Best Score"}
-    )
-    fig.update_traces(line=dict(width=3))
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(progression_line(record.query_id, record), use_container_width=True)
     
     # Exploration order vs score
-    fig = px.scatter(
-        visited_df, 
-        x="Exploration Order",
-        y="Heuristic",
-        size="Heuristic",
-        hover_name="Recipe",
-        title="Recipe Discovery Order vs. Similarity Score"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(discovery_scatter(record.query_id, record), use_container_width=True)
     
 with tab4:
     st.subheader("Recipe Similarity Network")
@@ -143,77 +240,7 @@ with tab4:
 
     # Ingredient Network Visualization
     try:
-        recipes = visited_df["Recipe"].head(8).tolist()
-        edges = [(recipes[i], recipes[j]) for i in range(len(recipes))
-                 for j in range(i + 1, len(recipes)) if i % 2 == j % 3]
-
-        G = nx.Graph()
-        G.add_edges_from(edges)
-        pos = nx.spring_layout(G, seed=42)
-
-        # Prepare edge traces
-        edge_x, edge_y = [], []
-        for edge in G.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x += [x0, x1, None]
-            edge_y += [y0, y1, None]
-
-        edge_trace = go.Scatter(
-            x=edge_x, y=edge_y,
-            line=dict(width=0.5, color='#888'),
-            hoverinfo='none',
-            mode='lines'
-        )
-
-        # Prepare node traces
-        node_x, node_y = [], []
-        for node in G.nodes():
-            x, y = pos[node]
-            node_x.append(x)
-            node_y.append(y)
-
-        # Create node trace
-        node_trace = go.Scatter(
-            x=node_x, 
-            y=node_y,
-            mode='markers+text',
-            text=[str(n) for n in G.nodes()],
-            textposition="top center",
-            hoverinfo='text'
-        )
-        
-        # Set marker properties
-        node_trace.marker = dict(
-            showscale=True,
-            colorscale='YlGnBu',
-            color=[len(list(G.neighbors(n))) for n in G.nodes()],
-            size=18,
-            line_width=2
-        )
-        
-        # Add colorbar configuration
-        node_trace.marker.colorbar = dict(
-            thickness=15,
-            title=dict(text='Connections', side='right'),
-            xanchor='left'
-        )
-
-        # Create the figure
-        fig = go.Figure(data=[edge_trace, node_trace])
-        
-        # Update layout with proper title font settings
-        fig.update_layout(
-            title_text="Ingredient Similarity Network",
-            title_font=dict(size=20),
-            showlegend=False,
-            hovermode='closest',
-            margin=dict(b=0, l=0, r=0, t=40),
-            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(similarity_network(record.query_id, record), use_container_width=True)
 
     except Exception as e:
         st.warning(f"Network visualization could not be generated: {str(e)}")
@@ -221,12 +248,12 @@ with tab4:
     
     # Show recipe statistics
     st.markdown("#### Recipe Statistics")
-    avg_ingredients = len(" ".join(visited_df['Recipe']).split()) / len(visited_df)
+    avg_ingredients = len(" ".join(record.names).split()) / len(record)
     st.metric("Average Recipe Name Length", f"{avg_ingredients:.1f} words")
     
 # Raw data section
 with st.expander("View Raw Exploration Data"):
-    st.dataframe(visited_df)
+    st.dataframe(raw_frame(record.query_id, record))
 
 # Add some space at the bottom
 st.markdown("---")
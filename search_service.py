@@ -0,0 +1,367 @@
+"""Headless JSON search API around BestFirstSearchRecipeFinder.
+
+Run it next to (or instead of) the Streamlit UI:
+
+    python search_service.py --port 8000
+
+Endpoints:
+    GET  /health        -> index generation and request counters
+    POST /search        -> {"query": "tomato onion", "top_k": 5}
+    POST /search/batch  -> {"queries": ["tomato", "rice egg"], "top_k": 5}
+
+Scoring is pure Python and holds the GIL, so it runs in a pool of worker
+processes. Each worker builds its own TF-IDF index from a pickled snapshot of
+the current recipes, and rebuilds when a request names a newer generation.
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import pandas as pd
+
+from best_first_search import BestFirstSearchRecipeFinder
+from index_manager import RECIPES_CSV, RecipeIndexManager, load_recipes
+
+MAX_TOP_K = 50
+MAX_BATCH = 100
+MAX_BODY_BYTES = 1 << 20
+MAX_HEADERS = 100
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+
+class BadRequest(Exception):
+    status = 400
+
+
+class LengthRequired(BadRequest):
+    status = 411
+
+
+class PayloadTooLarge(BadRequest):
+    status = 413
+
+
+class HeaderTooLarge(BadRequest):
+    status = 431
+
+
+def _clean(value):
+    """Make a DataFrame cell JSON-safe (numpy scalars, NaN)"""
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _parse_top_k(payload):
+    top_k = payload.get("top_k", 5)
+    if not isinstance(top_k, int) or isinstance(top_k, bool) or not 1 <= top_k <= MAX_TOP_K:
+        raise BadRequest(f"top_k must be an integer between 1 and {MAX_TOP_K}")
+    return top_k
+
+
+def _parse_query(query):
+    if not isinstance(query, str) or not query.strip():
+        raise BadRequest("query must be a non-empty string")
+    # Same normalisation the UI does when joining ingredient tags
+    return " ".join(query.lower().split())
+
+
+class RecipeData:
+    """Server-side generation payload: only the workers build the TF-IDF index"""
+
+    COLUMNS = {"name", "ingredients", "steps", "image"}
+
+    def __init__(self, recipes):
+        # Fail the reload here rather than in every worker
+        missing = self.COLUMNS - set(recipes.columns)
+        if missing:
+            raise ValueError(f"recipe data is missing columns: {sorted(missing)}")
+        self.recipes = recipes
+
+
+# --- Worker side: each executor process keeps one index, keyed by generation ---
+_worker = {}
+
+
+def _init_worker(finder_factory, generation_id, snapshot_path):
+    _worker["factory"] = finder_factory
+    _load_generation(generation_id, snapshot_path)
+
+
+def _load_generation(generation_id, snapshot_path):
+    _worker["finder"] = None  # drop the old index before building the new one
+    _worker["finder"] = _worker["factory"](pd.read_pickle(snapshot_path))
+    _worker["generation"] = generation_id
+
+
+def _search_in_worker(generation_id, snapshot_path, query, top_k):
+    if _worker.get("generation") != generation_id:
+        _load_generation(generation_id, snapshot_path)
+    finder = _worker["finder"]
+    top_recipes, visited = finder.search(query, top_k=top_k)
+    exploration = [
+        {"recipe": finder.recipes.iloc[int(idx)]["name"], "heuristic": float(score)}
+        for idx, score in visited
+    ]
+    results = [
+        {key: _clean(value) for key, value in row.items()}
+        for row in top_recipes.to_dict("records")
+    ]
+    return {
+        "query": query,
+        "generation": generation_id,
+        "results": results,
+        "exploration": exploration,
+    }
+
+
+class SearchService:
+    """Async front end that coalesces identical queries and scores them in worker processes"""
+
+    def __init__(self, index_manager, snapshot_dir, workers=4, finder_factory=BestFirstSearchRecipeFinder):
+        self.index_manager = index_manager
+        self.workers = workers
+        self._snapshot_dir = snapshot_dir
+        self._snapshots = {}
+        self._inflight = {}
+        self.requests = 0
+        self.searches = 0
+        self.coalesced = 0
+        with index_manager.acquire() as generation:
+            snapshot_path = self._snapshot(generation)
+        # spawn rather than fork: the server already runs the reload and asyncio threads
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(finder_factory, generation.generation_id, snapshot_path),
+        )
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    def _snapshot(self, generation):
+        """Pickle a generation's recipes once, for workers to build their index from"""
+        path = self._snapshots.get(generation.generation_id)
+        if path is not None:
+            return path
+        path = os.path.join(self._snapshot_dir, f"generation-{generation.generation_id}.pkl")
+        # Small (one DataFrame) and once per generation, so it's fine on the event loop
+        generation.finder.recipes.to_pickle(path)
+        self._snapshots[generation.generation_id] = path
+
+        # Keep only snapshots that the current generation or an in-flight search still needs
+        needed = {generation.generation_id} | {key[2] for key in self._inflight}
+        for generation_id in list(self._snapshots):
+            if generation_id not in needed:
+                os.remove(self._snapshots.pop(generation_id))
+        return path
+
+    async def search(self, query, top_k):
+        with self.index_manager.acquire() as generation:
+            generation_id = generation.generation_id
+            snapshot_path = self._snapshot(generation)
+
+        # Identical concurrent queries share one executor job
+        key = (query, top_k, generation_id)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            self.searches += 1
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self.executor, _search_in_worker, generation_id, snapshot_path, query, top_k
+            )
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield so one client disconnecting doesn't cancel the others' result
+        return await asyncio.shield(future)
+
+    def health(self):
+        return {
+            "status": "ok",
+            "generation": self.index_manager.generation_id,
+            "workers": self.workers,
+            "inflight": len(self._inflight),
+            "requests": self.requests,
+            "searches": self.searches,
+            "coalesced": self.coalesced,
+            "last_reload_error": str(self.index_manager.last_error) if self.index_manager.last_error else None,
+        }
+
+    async def dispatch(self, method, path, body):
+        self.requests += 1
+        if path == "/health":
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            return 200, self.health()
+        if path not in ("/search", "/search/batch"):
+            return 404, {"error": f"no route for {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "body must be JSON"}
+        if not isinstance(payload, dict):
+            return 400, {"error": "body must be a JSON object"}
+
+        try:
+            top_k = _parse_top_k(payload)
+            if path == "/search":
+                return 200, await self.search(_parse_query(payload.get("query")), top_k)
+            queries = payload.get("queries")
+            if not isinstance(queries, list) or not 1 <= len(queries) <= MAX_BATCH:
+                raise BadRequest(f"queries must be a list of 1 to {MAX_BATCH} strings")
+            queries = [_parse_query(q) for q in queries]
+        except BadRequest as e:
+            return e.status, {"error": str(e)}
+        results = await asyncio.gather(*(self.search(q, top_k) for q in queries))
+        return 200, {"results": results}
+
+
+async def _readline(reader):
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        # Line longer than the stream buffer limit
+        raise HeaderTooLarge("request line or header too long")
+
+
+async def _read_request(reader):
+    """Parse one HTTP/1.1 request; returns None when the client closed the connection"""
+    request_line = await _readline(reader)
+    if not request_line:
+        return None
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise BadRequest("malformed request line")
+
+    headers = {}
+    for _ in range(MAX_HEADERS + 1):
+        line = await _readline(reader)
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HeaderTooLarge(f"more than {MAX_HEADERS} header fields")
+
+    if "transfer-encoding" in headers:
+        # Only Content-Length framing is supported; guessing at the body would desync the stream
+        raise LengthRequired("Transfer-Encoding is not supported, send Content-Length")
+
+    try:
+        length = int(headers.get("content-length") or 0)
+        if length < 0:
+            raise ValueError(length)
+    except ValueError:
+        raise BadRequest("invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise PayloadTooLarge(f"body exceeds {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+
+    keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+    return method.upper(), target.split("?", 1)[0], body, keep_alive
+
+
+def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+
+
+async def handle_connection(service, reader, writer):
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except BadRequest as e:
+                _write_response(writer, e.status, {"error": str(e)}, keep_alive=False)
+                await writer.drain()
+                break
+            if request is None:
+                break
+            method, path, body, keep_alive = request
+            try:
+                status, payload = await service.dispatch(method, path, body)
+            except Exception as e:
+                status, payload = 500, {"error": str(e)}
+            _write_response(writer, status, payload, keep_alive)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host, port, index_manager, workers):
+    with tempfile.TemporaryDirectory(prefix="recipe-index-") as snapshot_dir:
+        service = SearchService(index_manager, snapshot_dir, workers)
+        try:
+            server = await asyncio.start_server(partial(handle_connection, service), host, port)
+            print(f"Serving recipe search on http://{host}:{port} "
+                  f"(generation {index_manager.generation_id}, {workers} workers)")
+            async with server:
+                await server.serve_forever()
+        finally:
+            service.close()
+
+
+async def _watch_source(index_manager, interval):
+    while True:
+        await asyncio.sleep(interval)
+        index_manager.reload_if_changed()
+
+
+async def main(args):
+    index_manager = RecipeIndexManager(
+        partial(load_recipes, args.data), source_path=args.data, finder_factory=RecipeData
+    )
+    watcher = asyncio.create_task(_watch_source(index_manager, args.reload_interval))
+    try:
+        await serve(args.host, args.port, index_manager, args.workers)
+    finally:
+        watcher.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless HTTP API for the recipe search engine")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--data", default=RECIPES_CSV, help="recipe CSV to index")
+    parser.add_argument("--workers", type=int, default=4, help="worker processes used for scoring")
+    parser.add_argument("--reload-interval", type=float, default=5.0,
+                        help="seconds between checks for a changed recipe CSV")
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
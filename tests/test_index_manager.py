@@ -0,0 +1,197 @@
+import os
+import threading
+import time
+
+from index_manager import RecipeIndexManager
+
+
+class StubFinder:
+    """Stands in for BestFirstSearchRecipeFinder; `recipes` is whatever the loader returned"""
+
+    def __init__(self, recipes, gate=None, started=None):
+        if started is not None:
+            started.set()
+        if gate is not None:
+            assert gate.wait(timeout=5)
+        self.recipes = recipes
+
+    def search(self, user_input, top_k=3):
+        time.sleep(0.001)
+        return self.recipes, [(0, 1.0)]
+
+
+def counting_loader():
+    count = [0]
+
+    def loader():
+        count[0] += 1
+        return count[0]
+
+    return loader
+
+
+def write_rows(path, rows, mtime):
+    path.write_text("\n".join(f"row{i}" for i in range(rows)))
+    os.utime(path, (mtime, mtime))
+
+
+def test_concurrent_queries_during_swaps():
+    # Each build loads the next number, so generation N indexes recipes == N
+    manager = RecipeIndexManager(counting_loader(), finder_factory=StubFinder)
+    stop = threading.Event()
+    seen = []
+    errors = []
+
+    def reader():
+        ids = []
+        try:
+            while not stop.is_set():
+                with manager.acquire() as generation:
+                    finder = generation.finder
+                    assert finder is not None
+                    assert not generation.released
+                    first, _ = finder.search("tomato")
+                    time.sleep(0.001)
+                    second, _ = generation.finder.search("tomato")
+                    assert first == second == generation.generation_id
+                    ids.append(generation.generation_id)
+                    seen.append(generation)
+                _, _, generation_id = manager.search("onion")
+                ids.append(generation_id)
+            assert ids == sorted(ids)
+        except Exception as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=reader) for _ in range(8)]
+    for thread in readers:
+        thread.start()
+    for _ in range(10):
+        manager.reload(wait=True)
+        time.sleep(0.005)
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    assert manager.generation_id == 11
+    assert len({generation.generation_id for generation in seen}) > 1
+    for generation in seen:
+        if generation.generation_id == manager.generation_id:
+            assert generation.refs == 1 and not generation.released
+        else:
+            assert generation.refs == 0 and generation.released
+            assert generation.finder is None
+
+
+def test_old_generation_released_after_last_reader():
+    manager = RecipeIndexManager(counting_loader(), finder_factory=StubFinder)
+
+    with manager.acquire() as old:
+        manager.reload(wait=True)
+        assert manager.generation_id == 2
+        assert not old.released
+        assert old.refs == 1
+        assert old.finder.search("tomato")[0] == 1
+
+    assert old.released
+    assert old.refs == 0
+    assert old.finder is None
+
+
+def test_generation_ids_increase():
+    manager = RecipeIndexManager(counting_loader(), finder_factory=StubFinder)
+    ids = [manager.generation_id]
+    for _ in range(5):
+        manager.reload(wait=True)
+        ids.append(manager.generation_id)
+    assert ids == [1, 2, 3, 4, 5, 6]
+
+
+def test_change_during_build_is_not_lost(tmp_path):
+    csv = tmp_path / "recipes.csv"
+    write_rows(csv, 3, mtime=1_000)
+    gate = threading.Event()
+    gate.set()
+    started = threading.Event()
+
+    def loader():
+        return len(csv.read_text().splitlines())
+
+    manager = RecipeIndexManager(
+        loader,
+        source_path=str(csv),
+        finder_factory=lambda recipes: StubFinder(recipes, gate, started),
+    )
+    gate.clear()
+    started.clear()
+
+    write_rows(csv, 4, mtime=2_000)
+    first = manager.reload_if_changed()
+    assert started.wait(timeout=5)
+
+    # Edited again while the first build is still running
+    write_rows(csv, 5, mtime=3_000)
+    assert manager.reload_if_changed() is first
+    gate.set()
+    first.join(timeout=5)
+
+    with manager.acquire() as generation:
+        assert generation.finder.recipes == 5
+    assert manager.generation_id == 3
+    assert manager.reload_if_changed() is None
+
+
+def test_failed_build_is_retried(tmp_path):
+    csv = tmp_path / "recipes.csv"
+    write_rows(csv, 3, mtime=1_000)
+
+    def loader():
+        text = csv.read_text()
+        if "partial" in text:
+            raise ValueError("half-written file")
+        return len(text.splitlines())
+
+    manager = RecipeIndexManager(loader, source_path=str(csv), finder_factory=StubFinder, retry_after=0)
+
+    csv.write_text("partial")
+    os.utime(csv, (2_000, 2_000))
+    manager.reload_if_changed(wait=True)
+    assert isinstance(manager.last_error, ValueError)
+    assert manager.generation_id == 1
+
+    # Same mtime, but the save has now finished
+    write_rows(csv, 4, mtime=2_000)
+    manager.reload_if_changed(wait=True)
+    assert manager.last_error is None
+    assert manager.generation_id == 2
+    assert manager.reload_if_changed() is None
+
+
+def test_failed_build_backs_off(tmp_path):
+    csv = tmp_path / "recipes.csv"
+    write_rows(csv, 3, mtime=1_000)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        if "partial" in csv.read_text():
+            raise ValueError("half-written file")
+        return len(csv.read_text().splitlines())
+
+    manager = RecipeIndexManager(loader, source_path=str(csv), finder_factory=StubFinder, retry_after=60)
+
+    csv.write_text("partial")
+    os.utime(csv, (2_000, 2_000))
+    manager.reload_if_changed(wait=True)
+    assert isinstance(manager.last_error, ValueError)
+
+    # Reruns while the file is still broken don't rebuild again
+    for _ in range(5):
+        assert manager.reload_if_changed(wait=True) is None
+    assert len(loads) == 2
+
+    # A new save is picked up right away
+    write_rows(csv, 4, mtime=3_000)
+    manager.reload_if_changed(wait=True)
+    assert manager.last_error is None
+    assert manager.generation_id == 2
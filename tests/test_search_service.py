@@ -0,0 +1,172 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from functools import partial
+
+import pandas as pd
+
+from index_manager import RecipeIndexManager
+from search_service import RecipeData, SearchService, handle_connection
+
+SEARCH_DELAY = 0.3
+
+
+class StubFinder:
+    """Runs inside the worker processes; slow enough for concurrent requests to overlap"""
+
+    def __init__(self, recipes):
+        self.recipes = recipes
+
+    def search(self, user_input, top_k=3):
+        time.sleep(SEARCH_DELAY)
+        top = self.recipes.head(top_k).assign(pid=os.getpid())
+        return top, [(i, 0.5) for i in range(min(top_k, len(self.recipes)))]
+
+
+def recipes():
+    return pd.DataFrame({
+        "name": ["soup", "salad", "stew"],
+        "ingredients": ["tomato onion", "lettuce", "beef potato"],
+        "steps": ["boil", "toss", "simmer"],
+        "image": [None, "//img/salad.png", None],
+    })
+
+
+@contextmanager
+def search_service():
+    manager = RecipeIndexManager(recipes, finder_factory=RecipeData)
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        service = SearchService(manager, snapshot_dir, workers=2, finder_factory=StubFinder)
+        try:
+            yield service
+        finally:
+            service.close()
+
+
+def exchange(raw):
+    """Send raw bytes to a fresh service and return (status, json body)"""
+
+    async def run():
+        with search_service() as service:
+            server = await asyncio.start_server(partial(handle_connection, service), "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(raw)
+                await writer.drain()
+                response = await asyncio.wait_for(reader.read(), timeout=30)
+                writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body)
+
+    return asyncio.run(run())
+
+
+def post(path, payload):
+    body = json.dumps(payload).encode()
+    return (
+        f"POST {path} HTTP/1.1\r\nConnection: close\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+
+
+def test_search():
+    status, body = exchange(post("/search", {"query": "Tomato  Onion", "top_k": 2}))
+    assert status == 200
+    assert body["query"] == "tomato onion"
+    assert body["generation"] == 1
+    assert [r["name"] for r in body["results"]] == ["soup", "salad"]
+    assert body["results"][0]["image"] is None
+    assert body["exploration"] == [
+        {"recipe": "soup", "heuristic": 0.5},
+        {"recipe": "salad", "heuristic": 0.5},
+    ]
+
+
+def test_search_runs_in_worker_process():
+    status, body = exchange(post("/search", {"query": "beef", "top_k": 1}))
+    assert status == 200
+    assert body["results"][0]["pid"] != os.getpid()
+
+
+def test_batch_search_coalesces_duplicates():
+    async def run():
+        with search_service() as service:
+            payload = {"queries": ["beef", "Beef ", "lettuce"], "top_k": 1}
+            status, body = await service.dispatch("POST", "/search/batch", json.dumps(payload).encode())
+            return status, body, service.searches, service.coalesced
+
+    status, body, searches, coalesced = asyncio.run(run())
+    assert status == 200
+    assert [r["query"] for r in body["results"]] == ["beef", "beef", "lettuce"]
+    assert searches == 2
+    assert coalesced == 1
+
+
+def test_concurrent_identical_queries_share_one_search():
+    async def run():
+        with search_service() as service:
+            results = await asyncio.gather(*(service.search("beef", 1) for _ in range(5)))
+            return results, service.searches, service.coalesced
+
+    results, searches, coalesced = asyncio.run(run())
+    assert searches == 1
+    assert coalesced == 4
+    assert all(result == results[0] for result in results)
+
+
+def test_coalescing_key_changes_after_swap():
+    async def run():
+        with search_service() as service:
+            first = asyncio.create_task(service.search("beef", 1))
+            await asyncio.sleep(0)  # let the first search register as in flight
+            service.index_manager.reload(wait=True)
+            second = await service.search("beef", 1)
+            return await first, second, service.searches, service.coalesced
+
+    first, second, searches, coalesced = asyncio.run(run())
+    assert first["generation"] == 1
+    assert second["generation"] == 2
+    assert searches == 2
+    assert coalesced == 0
+
+
+def test_health():
+    status, body = exchange(b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n")
+    assert status == 200
+    assert body["status"] == "ok"
+
+
+def test_rejects_bad_top_k():
+    status, body = exchange(post("/search", {"query": "beef", "top_k": 0}))
+    assert status == 400
+
+
+def test_rejects_negative_content_length():
+    status, body = exchange(b"POST /search HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+    assert status == 400
+    assert body["error"] == "invalid Content-Length"
+
+
+def test_rejects_oversized_header_line():
+    status, _ = exchange(b"GET /health HTTP/1.1\r\nX-Big: " + b"a" * (70 * 1024) + b"\r\n\r\n")
+    assert status == 431
+
+
+def test_rejects_chunked_body():
+    raw = (
+        b"POST /search HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+        b"11\r\n{\"query\": \"beef\"}\r\n0\r\n\r\n"
+    )
+    status, body = exchange(raw)
+    assert status == 411
+    assert "Transfer-Encoding" in body["error"]
+
+
+def test_rejects_too_many_headers():
+    headers = b"".join(b"X-H%d: 1\r\n" % i for i in range(500))
+    status, _ = exchange(b"GET /health HTTP/1.1\r\n" + headers + b"\r\n")
+    assert status == 431